@@ -6,7 +6,7 @@ import sys
 import os
 import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import Any, List, Optional
 
 # Add src directory to path
 project_root = Path(__file__).parent
@@ -428,6 +428,26 @@ class IntegratedWindowsAgent:
             logger.error(f"Error processing message: {e}")
             return f"I encountered an error while processing your request: {str(e)}"
     
+    async def process_messages(self, messages: List[str], context: Optional[dict] = None,
+                               return_exceptions: bool = False) -> List[Any]:
+        """Process several messages, returning responses in the same order
+
+        The Gemini client has no batch endpoint, so messages go through
+        process_message one at a time: they share one chat session, the
+        memory manager and the desktop, none of which tolerate concurrent
+        use. With return_exceptions, an exception is placed in the result
+        list instead of aborting the remaining messages.
+        """
+        responses = []
+        for message in messages:
+            try:
+                responses.append(await self.process_message(message, context))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                responses.append(e)
+        return responses
+    
     async def _analyze_user_intent(self, message: str, memory_context: dict) -> dict:
         """Use Gemini to intelligently analyze user intent and determine action"""
         
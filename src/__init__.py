@@ -13,10 +13,30 @@ __version__ = "1.0.0"
 __author__ = "AI Assistant"
 __description__ = "Advanced Windows AI Agent with Gemini Integration"
 
-from .core.agent import WindowsAIAgent
-from .core.gemini_client import GeminiClient
-from .ui.chat_window import ChatWindow
-from .utils.config import Config
+import importlib
+
+# Public name -> submodule defining it. Imported on first access (PEP 562),
+# so importing any src.* module does not load the agent, Gemini SDK and Qt
+_LAZY_EXPORTS = {
+    'WindowsAIAgent': '.core.agent',
+    'GeminiClient': '.core.gemini_client',
+    'ChatWindow': '.ui.chat_window',
+    'Config': '.utils.config',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
+
 
 __all__ = [
     'WindowsAIAgent',
@@ -82,6 +82,9 @@ class WindowsAutomation:
         self.last_screenshot = None
         self.last_screenshot_time = 0
         
+        # Queried once; call invalidate_screen_size() after a resolution change
+        self._screen_size: Optional[Tuple[int, int]] = None
+        
         # Check dependencies
         self.pyautogui_available = PYAUTOGUI_AVAILABLE
         self.win32_available = WIN32_AVAILABLE
@@ -542,17 +545,26 @@ class WindowsAutomation:
     # System Information
     
     def get_screen_size(self) -> Tuple[int, int]:
-        """Get screen dimensions"""
+        """Get screen dimensions (cached after the first query)"""
+        if self._screen_size is not None:
+            return self._screen_size
+        
         if not self.pyautogui_available:
             logger.warning("PyAutoGUI not available for screen info")
-            return (1920, 1080)  # Fallback default
+            self._screen_size = (1920, 1080)  # Fallback default
+            return self._screen_size
         
         try:
-            return pyautogui.size()
+            self._screen_size = tuple(pyautogui.size())
+            return self._screen_size
         except Exception as e:
             logger.error(f"Failed to get screen size: {e}")
             return (1920, 1080)  # Fallback default
     
+    def invalidate_screen_size(self):
+        """Forget the cached screen size, e.g. after a display change"""
+        self._screen_size = None
+    
     def get_mouse_position(self) -> Tuple[int, int]:
         """Get current mouse position"""
         if not self.pyautogui_available:
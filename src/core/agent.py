@@ -203,7 +203,7 @@ class WindowsAIAgent:
         """Stream response for real-time conversation"""
         try:
             if not self.gemini_client or not self.gemini_client.is_configured:
-                yield "I'm sorry, but I'm not properly configured."
+                yield "I'm sorry, but I'm not properly configured. Please check the API key and restart."
                 return
             
             self._log_interaction("user", message)
@@ -213,6 +213,7 @@ class WindowsAIAgent:
             # Check for capabilities first
             capability_result = await self._check_capabilities(message)
             if capability_result:
+                self._log_interaction("agent", capability_result.message)
                 yield capability_result.message
                 return
             
@@ -228,7 +229,7 @@ class WindowsAIAgent:
             
         except Exception as e:
             logger.error(f"Error streaming response: {e}")
-            yield f"Error: {str(e)}"
+            yield f"I encountered an error while processing your request: {str(e)}"
     
     async def _check_capabilities(self, message: str) -> Optional[ActionResult]:
         """Check if message matches specific capabilities"""
@@ -142,8 +142,8 @@ Response: "I'll open the Windows Calculator app and perform that calculation for
 
 Remember: You are a powerful desktop assistant, so be confident in your abilities while remaining safe and helpful."""
 
-    async def send_message(self, message: str, context: Optional[Dict] = None) -> str:
-        """Send a message to Gemini and get response"""
+    def _reject_message(self, message: str) -> Optional[str]:
+        """Return the reply for a message that must not be sent, else None"""
         if not self.model or not self.chat_session:
             return "Sorry, I'm not properly configured. Please check the API key and try again."
         
@@ -154,6 +154,35 @@ Remember: You are a powerful desktop assistant, so be confident in your abilitie
         if len(message) > 50000:  # Reasonable limit
             return "That message is too long. Please try breaking it into smaller parts."
         
+        return None
+    
+    def _describe_error(self, e: Exception) -> str:
+        """Log an API error and turn it into a user-facing reply"""
+        error_msg = str(e).lower()
+        
+        # Handle specific API errors
+        if "quota" in error_msg or "limit" in error_msg:
+            logger.error(f"API quota/limit exceeded: {e}")
+            return "I'm currently experiencing high demand. Please try again in a moment, or check your API quota."
+        elif "rate" in error_msg or "429" in error_msg:
+            logger.error(f"Rate limited: {e}")
+            return "I'm sending requests too quickly. Let me slow down and try again in a moment."
+        elif "invalid" in error_msg and "api" in error_msg:
+            logger.error(f"Invalid API key: {e}")
+            return "There seems to be an issue with my configuration. Please check the API key settings."
+        elif "network" in error_msg or "connection" in error_msg:
+            logger.error(f"Network error: {e}")
+            return "I'm having trouble connecting to the AI service. Please check your internet connection."
+        else:
+            logger.error(f"Failed to send message to Gemini: {e}")
+            return f"I encountered an error while processing your request: {str(e)}"
+    
+    async def send_message(self, message: str, context: Optional[Dict] = None) -> str:
+        """Send a message to Gemini and get response"""
+        rejection = self._reject_message(message)
+        if rejection is not None:
+            return rejection
+        
         try:
             # Add user message to history
             user_msg = Message(role="user", content=message)
@@ -162,8 +191,11 @@ Remember: You are a powerful desktop assistant, so be confident in your abilitie
             # Enhance message with intelligent context awareness
             full_message = self._build_intelligent_prompt(message, context)
             
-            # Send to Gemini
-            response = await asyncio.to_thread(
+            # Send to Gemini. run_in_executor rather than to_thread: nothing
+            # here reads context variables, so copying the context per call
+            # is wasted work.
+            response = await asyncio.get_running_loop().run_in_executor(
+                None,
                 self.chat_session.send_message, 
                 full_message
             )
@@ -182,50 +214,35 @@ Remember: You are a powerful desktop assistant, so be confident in your abilitie
             return response_text
             
         except Exception as e:
-            error_msg = str(e).lower()
-            
-            # Handle specific API errors
-            if "quota" in error_msg or "limit" in error_msg:
-                logger.error(f"API quota/limit exceeded: {e}")
-                return "I'm currently experiencing high demand. Please try again in a moment, or check your API quota."
-            elif "rate" in error_msg or "429" in error_msg:
-                logger.error(f"Rate limited: {e}")
-                return "I'm sending requests too quickly. Let me slow down and try again in a moment."
-            elif "invalid" in error_msg and "api" in error_msg:
-                logger.error(f"Invalid API key: {e}")
-                return "There seems to be an issue with my configuration. Please check the API key settings."
-            elif "network" in error_msg or "connection" in error_msg:
-                logger.error(f"Network error: {e}")
-                return "I'm having trouble connecting to the AI service. Please check your internet connection."
-            else:
-                logger.error(f"Failed to send message to Gemini: {e}")
-                return f"I encountered an error while processing your request: {str(e)}"
+            return self._describe_error(e)
     
     async def stream_message(self, message: str, context: Optional[Dict] = None) -> AsyncGenerator[str, None]:
-        """Send message and stream the response"""
-        if not self.model or not self.chat_session:
-            yield "Sorry, I'm not properly configured. Please check the API key."
+        """Send message and stream the response
+
+        Uses the same input checks, prompt and error replies as send_message.
+        """
+        rejection = self._reject_message(message)
+        if rejection is not None:
+            yield rejection
             return
         
+        response_parts = []
         try:
             # Add user message to history
             user_msg = Message(role="user", content=message)
             self.conversation_history.append(user_msg)
             
-            # Prepare message with context
-            full_message = message
-            if context:
-                context_str = self._format_context(context)
-                full_message = f"{context_str}\n\nUser request: {message}"
+            # Enhance message with intelligent context awareness
+            full_message = self._build_intelligent_prompt(message, context)
             
             # Stream response - Fix: Handle streaming properly
-            response_parts = []
-            
             def stream_generator():
                 return self.chat_session.send_message(full_message, stream=True)
             
             # Get the streaming response in a thread
-            stream_response = await asyncio.to_thread(stream_generator)
+            stream_response = await asyncio.get_running_loop().run_in_executor(
+                None, stream_generator
+            )
             
             # Process each chunk
             for chunk in stream_response:
@@ -242,8 +259,9 @@ Remember: You are a powerful desktop assistant, so be confident in your abilitie
             self._trim_history()
             
         except Exception as e:
-            logger.error(f"Failed to stream message: {e}")
-            yield f"Error: {str(e)}"
+            reply = self._describe_error(e)
+            # Keep the error apart from any text that was already streamed
+            yield f"\n\n{reply}" if response_parts else reply
     
     def _build_intelligent_prompt(self, message: str, context: dict) -> str:
         """Build an intelligent, context-aware prompt for Gemini"""
@@ -6,7 +6,7 @@ import re
 import json
 import time
 from typing import Dict, List, Optional, Any, Callable, Pattern
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import asyncio
 from pathlib import Path
@@ -36,6 +36,11 @@ class IntentParameter:
     description: str = ""
     default: Any = None
     validation_pattern: Optional[str] = None
+    validation_regex: Optional[Pattern] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.validation_pattern:
+            self.validation_regex = re.compile(self.validation_pattern)
 
 
 @dataclass
@@ -49,10 +54,17 @@ class Intent:
     requires_confirmation: bool = False
     description: str = ""
     examples: List[str] = None
+    compiled_patterns: List[Pattern] = field(default_factory=list, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.examples is None:
             self.examples = []
+        
+        # Compile regex patterns once, so matching never re-compiles
+        self.compiled_patterns = [
+            re.compile(pattern, re.IGNORECASE)
+            for pattern in self.patterns
+        ]
 
 
 @dataclass
@@ -84,11 +96,8 @@ class IntentRecognizer:
         
         self.intents[intent.name] = intent
         
-        # Compile regex patterns
-        self.compiled_patterns[intent.name] = [
-            re.compile(pattern, re.IGNORECASE) 
-            for pattern in intent.patterns
-        ]
+        # Patterns were compiled when the intent was built
+        self.compiled_patterns[intent.name] = intent.compiled_patterns
         
         logger.debug(f"Registered intent: {intent.name}")
     
@@ -97,8 +106,8 @@ class IntentRecognizer:
         best_match = None
         best_confidence = 0.0
         
-        for intent_name, intent in self.intents.items():
-            for pattern in self.compiled_patterns[intent_name]:
+        for intent in self.intents.values():
+            for pattern in intent.compiled_patterns:
                 match = pattern.search(text)
                 if match:
                     # Extract parameters from match groups
@@ -239,8 +248,8 @@ class IntentRecognizer:
                 continue
             
             # Validate pattern if specified
-            if value and param.validation_pattern:
-                if not re.match(param.validation_pattern, str(value)):
+            if value and param.validation_regex is not None:
+                if not param.validation_regex.match(str(value)):
                     errors.append(f"Parameter '{param_name}' doesn't match required pattern")
         
         return {
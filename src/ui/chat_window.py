@@ -3,9 +3,11 @@ Modern PyQt6 Chat Window for Windows AI Agent
 """
 
 import sys
-import asyncio
 import time
-from typing import Optional, List, Dict, Any
+import threading
+import functools
+from collections import deque
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from pathlib import Path
 import json
 
@@ -16,18 +18,183 @@ from PyQt6.QtWidgets import (
     QMessageBox, QFileDialog, QSystemTrayIcon, QCheckBox, QSpinBox
 )
 from PyQt6.QtCore import (
-    Qt, QThread, pyqtSignal, QTimer, QPropertyAnimation, 
-    QEasingCurve, QRect, QSize, pyqtSlot
+    Qt, pyqtSignal, QTimer, QPropertyAnimation, 
+    QEasingCurve, QRect, QSize, pyqtSlot, QObject, QRunnable, QThreadPool
 )
 from PyQt6.QtGui import (
     QFont, QColor, QPalette, QPixmap, QIcon, QAction,
-    QTextCursor, QTextCharFormat, QPainter, QPen
+    QTextCursor, QTextCharFormat, QPainter, QPen, QFontMetrics
 )
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from loguru import logger
-from ..core.agent import WindowsAIAgent
 from ..utils.config import config
 
+if TYPE_CHECKING:
+    from ..core.agent import WindowsAIAgent
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_font(point_size: int, bold: bool = False) -> QFont:
+    """Return a shared Segoe UI font, constructed once per size/weight.
+
+    Built lazily because QFont needs a QGuiApplication to exist.
+    """
+    if bold:
+        return QFont("Segoe UI", point_size, QFont.Weight.Bold)
+    return QFont("Segoe UI", point_size)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_timestamp(seconds: int) -> str:
+    """Format a whole-second timestamp as HH:MM:SS (cached per second)"""
+    return time.strftime("%H:%M:%S", time.localtime(seconds))
+
+
+# Shown on startup and after every clear_chat
+_WELCOME_TEXT = """👋 **Welcome to Windows AI Agent!**
+
+I'm your intelligent desktop assistant. I can help you with:
+
+• **Desktop Automation** - Click, type, take screenshots
+• **File Operations** - Create, organize, and manage files  
+• **System Information** - Check performance and status
+• **Application Control** - Open and manage programs
+• **Code Execution** - Run Python code safely
+• **Natural Conversation** - Just ask me anything!
+
+**Quick Examples:**
+- "Take a screenshot"
+- "Open calculator" 
+- "Show system information"
+- "Create a file called notes.txt"
+
+Type your message below to get started! 🚀"""
+
+
+# Message bubble rules, shared by both themes and resolved once per theme
+# instead of being parsed again for every MessageWidget instance.
+_MESSAGE_STYLESHEET = """
+    MessageWidget[role="user"] {
+        background-color: #0078d4;
+        border-radius: 12px;
+        margin: 2px 50px 2px 2px;
+    }
+    MessageWidget[role="user"] QLabel#sender {
+        color: white;
+    }
+    MessageWidget[role="user"] QLabel#time {
+        color: #e0e0e0;
+    }
+    MessageWidget[role="user"] QLabel#message {
+        color: white;
+    }
+    MessageWidget[role="ai"] {
+        background-color: #f1f1f1;
+        border-radius: 12px;
+        margin: 2px 2px 2px 50px;
+    }
+    MessageWidget[role="ai"] QLabel#sender {
+        color: #0078d4;
+    }
+    MessageWidget[role="ai"] QLabel#time {
+        color: #666666;
+    }
+    MessageWidget[role="ai"] QLabel#message {
+        color: #333333;
+    }
+"""
+
+
+# Application-wide theme stylesheets (installed on the QApplication)
+_DARK_STYLESHEET = """
+    QMainWindow {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+    QScrollArea {
+        background-color: #1e1e1e;
+        border: none;
+    }
+    QLineEdit {
+        background-color: #3c3c3c;
+        border: 2px solid #555555;
+        border-radius: 20px;
+        padding: 8px 16px;
+        color: #ffffff;
+        font-size: 11pt;
+    }
+    QLineEdit:focus {
+        border-color: #0078d4;
+    }
+    QPushButton {
+        background-color: #0078d4;
+        color: white;
+        border: none;
+        border-radius: 20px;
+        padding: 8px 16px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #106ebe;
+    }
+    QPushButton:pressed {
+        background-color: #005a9e;
+    }
+    QMenuBar {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+    QMenuBar::item:selected {
+        background-color: #0078d4;
+    }
+    QStatusBar {
+        background-color: #1e1e1e;
+        color: #cccccc;
+    }
+""" + _MESSAGE_STYLESHEET
+
+_LIGHT_STYLESHEET = """
+    QMainWindow {
+        background-color: #ffffff;
+        color: #000000;
+    }
+    QScrollArea {
+        background-color: #f5f5f5;
+        border: none;
+    }
+    QLineEdit {
+        background-color: #ffffff;
+        border: 2px solid #cccccc;
+        border-radius: 20px;
+        padding: 8px 16px;
+        color: #000000;
+        font-size: 11pt;
+    }
+    QLineEdit:focus {
+        border-color: #0078d4;
+    }
+    QPushButton {
+        background-color: #0078d4;
+        color: white;
+        border: none;
+        border-radius: 20px;
+        padding: 8px 16px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #106ebe;
+    }
+    QPushButton:pressed {
+        background-color: #005a9e;
+    }
+""" + _MESSAGE_STYLESHEET
+
 
 class MessageWidget(QFrame):
     """Individual message widget with styling"""
@@ -51,11 +218,11 @@ class MessageWidget(QFrame):
         header_layout = QHBoxLayout()
         
         self.sender_label = QLabel(self.sender)
-        self.sender_label.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
+        self.sender_label.setFont(_shared_font(9, bold=True))
         
-        time_str = time.strftime("%H:%M:%S", time.localtime(self.timestamp))
+        time_str = _format_timestamp(int(self.timestamp))
         self.time_label = QLabel(time_str)
-        self.time_label.setFont(QFont("Segoe UI", 8))
+        self.time_label.setFont(_shared_font(8))
         
         header_layout.addWidget(self.sender_label)
         header_layout.addStretch()
@@ -64,99 +231,314 @@ class MessageWidget(QFrame):
         # Message content
         self.message_label = QLabel(self.message)
         self.message_label.setWordWrap(True)
-        self.message_label.setFont(QFont("Segoe UI", 10))
+        self.message_label.setFont(_shared_font(10))
         self.message_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
         
         layout.addLayout(header_layout)
         layout.addWidget(self.message_label)
     
+    def append_text(self, text: str):
+        """Append streamed text to the message body"""
+        self.message += text
+        self.message_label.setText(self.message)
+    
+    def set_text(self, text: str):
+        """Replace the message body"""
+        self.message = text
+        self.message_label.setText(text)
+    
     def apply_styling(self):
-        """Apply styling based on sender"""
-        if self.sender == "You":
-            # User message styling
-            self.setStyleSheet("""
-                MessageWidget {
-                    background-color: #0078d4;
-                    border-radius: 12px;
-                    margin: 2px 50px 2px 2px;
-                }
-            """)
-            self.sender_label.setStyleSheet("color: white;")
-            self.time_label.setStyleSheet("color: #e0e0e0;")
-            self.message_label.setStyleSheet("color: white;")
-        else:
-            # AI message styling
-            self.setStyleSheet("""
-                MessageWidget {
-                    background-color: #f1f1f1;
-                    border-radius: 12px;
-                    margin: 2px 2px 2px 50px;
-                }
-            """)
-            self.sender_label.setStyleSheet("color: #0078d4;")
-            self.time_label.setStyleSheet("color: #666666;")
-            self.message_label.setStyleSheet("color: #333333;")
-
-
-class ChatThread(QThread):
-    """Thread for handling AI chat responses"""
+        """Apply styling based on sender
+
+        The actual rules live in the window stylesheet (see
+        ``_MESSAGE_STYLESHEET``); here we only tag the widget so the
+        ``role`` property selectors match.
+        """
+        self.setProperty("role", "user" if self.sender == "You" else "ai")
+        self.sender_label.setObjectName("sender")
+        self.time_label.setObjectName("time")
+        self.message_label.setObjectName("message")
+        
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
+
+
+class ChunkRing:
+    """Fixed-capacity single-producer/single-consumer ring of text chunks
+
+    The producer only ever advances ``tail`` and the consumer only ever
+    advances ``head``; each update is a single assignment under the GIL,
+    so the two sides never need a lock.
+    """
+    
+    __slots__ = ("buf", "head", "tail", "mask")
+    
+    def __init__(self, capacity: int = 1024):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("ChunkRing capacity must be a power of two")
+        self.buf: List[Optional[str]] = [None] * capacity
+        self.head = 0
+        self.tail = 0
+        self.mask = capacity - 1
+    
+    def push(self, chunk: str) -> bool:
+        """Append a chunk (producer side); returns False if the ring is full"""
+        tail = self.tail
+        if tail - self.head > self.mask:
+            return False
+        self.buf[tail & self.mask] = chunk
+        self.tail = tail + 1
+        return True
+    
+    def drain(self) -> str:
+        """Take every available chunk (consumer side) as one string"""
+        head, tail = self.head, self.tail
+        if head == tail:
+            return ""
+        
+        buf, mask = self.buf, self.mask
+        parts = []
+        for i in range(head, tail):
+            parts.append(buf[i & mask])
+            buf[i & mask] = None
+        self.head = tail
+        return "".join(parts)
+
+
+class ChatWorker(QObject):
+    """Runs agent requests on one persistent background asyncio loop
+
+    Messages are queued onto the loop and handled one at a time by a
+    single consumer task; results come back to the GUI through queued
+    Qt signals. Streamed text is not signalled per chunk: it is pushed
+    into ``chunks`` and the GUI drains it at its own frame rate after
+    ``stream_started`` fires.
+    """
     
     message_received = pyqtSignal(str)
-    message_chunk = pyqtSignal(str)
+    stream_started = pyqtSignal()
     error_occurred = pyqtSignal(str)
     
-    def __init__(self, agent: WindowsAIAgent):
+    def __init__(self, agent: "WindowsAIAgent"):
         super().__init__()
         self.agent = agent
-        self.message_queue = []
+        self.loop = None
         self.is_processing = False
+        self.chunks = ChunkRing()
+        self._queue = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="ChatWorker", daemon=True
+        )
+    
+    def start(self):
+        """Start the background loop (no-op if already running)"""
+        if not self._thread.is_alive():
+            self._thread.start()
+            self._ready.wait()
+    
+    def stop(self):
+        """Stop the background loop and wait briefly for it to exit"""
+        if self.loop is not None and self._thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=2)
     
     def send_message(self, message: str, context: Optional[Dict] = None):
         """Queue a message for processing"""
-        self.message_queue.append((message, context))
-        if not self.is_processing:
-            self.start()
+        self.start()
+        self.loop.call_soon_threadsafe(self._queue.put_nowait, (message, context))
     
-    def run(self):
-        """Process queued messages"""
-        self.is_processing = True
-        
-        while self.message_queue:
-            message, context = self.message_queue.pop(0)
+    def _run_loop(self):
+        """Thread body: own the asyncio loop for the worker's lifetime"""
+        import asyncio
+        
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._queue = asyncio.Queue()
+        self.loop.create_task(self._consume())
+        self._ready.set()
+        
+        try:
+            self.loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(
+                asyncio.gather(*pending, return_exceptions=True)
+            )
+            self.loop.close()
+    
+    async def _consume(self):
+        """Process queued messages in order
+
+        Each request is awaited inline rather than wrapped in its own
+        Task, so no per-message Task (and contextvars copy) is created.
+        """
+        while True:
+            message, context = await self._queue.get()
+            self.is_processing = True
             
             try:
-                # Create event loop for async operations
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                # Get response from agent
-                response = loop.run_until_complete(
-                    self.agent.process_message(message, context)
-                )
+                # Get response from agent, streaming chunks when supported
+                if hasattr(self.agent, "stream_response"):
+                    response = await self._stream_response(message, context)
+                else:
+                    response = await self.agent.process_message(message, context)
                 
                 self.message_received.emit(response)
                 
             except Exception as e:
-                logger.error(f"Error in chat thread: {e}")
+                logger.error(f"Error in chat worker: {e}")
                 self.error_occurred.emit(str(e))
             finally:
-                loop.close()
-        
-        self.is_processing = False
+                self.is_processing = False
+    
+    async def _stream_response(self, message: str, context: Optional[Dict]) -> str:
+        """Publish response chunks as they arrive and return the full text"""
+        import asyncio
+        
+        parts = []
+        async for chunk in self.agent.stream_response(message, context):
+            if not parts:
+                self.stream_started.emit()
+            parts.append(chunk)
+            
+            # Ring full means the GUI is behind; back off instead of dropping
+            while not self.chunks.push(chunk):
+                await asyncio.sleep(0.005)
+        return "".join(parts)
+
+
+def _dump_history(history: List[Dict[str, Any]]) -> bytes:
+    """Serialize conversation history to indented JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(history, option=orjson.OPT_INDENT_2)
+    return json.dumps(history, indent=2).encode("utf-8")
+
+
+def _parse_history(data: bytes) -> List[Dict[str, Any]]:
+    """Parse and validate a saved conversation in one pass"""
+    history = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+    if not isinstance(history, list):
+        raise ValueError("Conversation file must contain a list of messages")
+    
+    messages = []
+    for index, entry in enumerate(history):
+        try:
+            messages.append({
+                "message": str(entry["message"]),
+                "sender": str(entry["sender"]),
+                "timestamp": float(entry["timestamp"])
+            })
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid message at index {index}: {e}")
+    return messages
+
+
+class SaveSignals(QObject):
+    """Signals emitted by ConversationSaver"""
+    
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+
+class ConversationSaver(QRunnable):
+    """Thread pool task that writes a conversation snapshot to disk"""
+    
+    def __init__(self, history: List[Dict[str, Any]], filename: str):
+        super().__init__()
+        self.history = history
+        self.filename = filename
+        self.signals = SaveSignals()
+    
+    def run(self):
+        """Serialize and write the conversation"""
+        try:
+            Path(self.filename).write_bytes(_dump_history(self.history))
+            self.signals.finished.emit(self.filename)
+        except Exception as e:
+            logger.error(f"Failed to save conversation: {e}")
+            self.signals.failed.emit(str(e))
+
+
+class LoadSignals(QObject):
+    """Signals emitted by ConversationLoader"""
+    
+    loaded = pyqtSignal(str, list)
+    failed = pyqtSignal(str)
+
+
+class ConversationLoader(QRunnable):
+    """Thread pool task that reads and validates a saved conversation"""
+    
+    def __init__(self, filename: str):
+        super().__init__()
+        self.filename = filename
+        self.signals = LoadSignals()
+    
+    def run(self):
+        """Read and parse the conversation file"""
+        try:
+            messages = _parse_history(Path(self.filename).read_bytes())
+            self.signals.loaded.emit(self.filename, messages)
+        except Exception as e:
+            logger.error(f"Failed to load conversation: {e}")
+            self.signals.failed.emit(str(e))
 
 
 class TypingIndicator(QLabel):
-    """Animated typing indicator"""
+    """Animated typing indicator
+
+    The animation frames are rendered to pixmaps once and cycled by
+    index, so each tick only repaints the label and never changes its
+    size (a setText per tick re-laid out the whole message list).
+    """
+    
+    BASE_TEXT = "AI is thinking"
+    FRAME_COUNT = 4
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setText("AI is thinking")
-        self.setFont(QFont("Segoe UI", 9))
-        self.setStyleSheet("color: #666666; font-style: italic;")
+        self._frames = self._render_frames()
+        self.setPixmap(self._frames[0])
+        self.setFixedSize(self._frames[-1].deviceIndependentSize().toSize())
         
         self.dots = 0
+        self._paused = False
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_dots)
+    
+    def _render_frames(self) -> List[QPixmap]:
+        """Render one pixmap per dot count"""
+        font = QFont(_shared_font(9))
+        font.setItalic(True)
+        metrics = QFontMetrics(font)
+        
+        texts = [self.BASE_TEXT + "." * i for i in range(self.FRAME_COUNT)]
+        width = max(metrics.horizontalAdvance(text) for text in texts) + 2
+        height = metrics.height()
+        ratio = self.devicePixelRatioF()
+        
+        frames = []
+        for text in texts:
+            pixmap = QPixmap(int(width * ratio), int(height * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            
+            painter = QPainter(pixmap)
+            painter.setFont(font)
+            painter.setPen(QColor("#666666"))
+            painter.drawText(
+                QRect(0, 0, width, height),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                text
+            )
+            painter.end()
+            
+            frames.append(pixmap)
+        return frames
         
     def start_animation(self):
         """Start typing animation"""
@@ -166,13 +548,25 @@ class TypingIndicator(QLabel):
     def stop_animation(self):
         """Stop typing animation"""
         self.timer.stop()
+        self._paused = False
         self.hide()
     
+    def pause_animation(self):
+        """Stop ticking without hiding, e.g. while the window is hidden"""
+        if self.timer.isActive():
+            self.timer.stop()
+            self._paused = True
+    
+    def resume_animation(self):
+        """Resume ticking after pause_animation"""
+        if self._paused:
+            self._paused = False
+            self.timer.start(500)
+    
     def update_dots(self):
         """Update dot animation"""
-        self.dots = (self.dots + 1) % 4
-        dots_text = "." * self.dots
-        self.setText(f"AI is thinking{dots_text}")
+        self.dots = (self.dots + 1) % self.FRAME_COUNT
+        self.setPixmap(self._frames[self.dots])
 
 
 class ChatWindow(QMainWindow):
@@ -181,19 +575,44 @@ class ChatWindow(QMainWindow):
     def __init__(self, agent=None):
         super().__init__()
         
-        # Initialize agent - use provided agent or create new one
-        self.agent = agent if agent is not None else WindowsAIAgent()
-        self.chat_thread = ChatThread(self.agent)
+        # Initialize agent - use provided agent or create new one. The agent
+        # module pulls in the Gemini SDK and automation backends, so it is
+        # only imported when we actually need to build one.
+        if agent is None:
+            from ..core.agent import WindowsAIAgent
+            agent = WindowsAIAgent()
+        self.agent = agent
+        self.chat_worker = ChatWorker(self.agent)
         
         # UI Components
         self.messages_layout = None
         self.scroll_area = None
+        self._vbar = None
         self.input_field = None
         self.send_button = None
         self.typing_indicator = None
         
-        # State
-        self.conversation_history = []
+        # State - history is kept column-wise (one bounded deque per field)
+        # and only materialized as dicts on demand, see conversation_history
+        max_history = config.max_chat_history
+        self._hist_messages: deque = deque(maxlen=max_history)
+        self._hist_senders: deque = deque(maxlen=max_history)
+        self._hist_timestamps: deque = deque(maxlen=max_history)
+        self._max_visible_messages = config.max_visible_messages
+        
+        # Debounced auto-scroll: a burst of messages restarts the countdown
+        # so only one scroll happens once the layout has settled
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(16)
+        self._scroll_timer.timeout.connect(self.scroll_to_bottom)
+        
+        # Streaming replies: the worker's chunk ring is drained into the
+        # in-progress message once per frame while a reply is streaming
+        self._streaming_widget: Optional[MessageWidget] = None
+        self._chunk_timer = QTimer(self)
+        self._chunk_timer.setInterval(16)
+        self._chunk_timer.timeout.connect(self._flush_chunks)
         
         # Setup
         self.setup_ui()
@@ -283,6 +702,7 @@ class ChatWindow(QMainWindow):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self._vbar = self.scroll_area.verticalScrollBar()
         
         # Messages container
         messages_container = QWidget()
@@ -312,12 +732,12 @@ class ChatWindow(QMainWindow):
         # Input field
         self.input_field = QLineEdit()
         self.input_field.setPlaceholderText("Type your message here...")
-        self.input_field.setFont(QFont("Segoe UI", 11))
+        self.input_field.setFont(_shared_font(11))
         self.input_field.setMinimumHeight(40)
         
         # Send button
         self.send_button = QPushButton("Send")
-        self.send_button.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        self.send_button.setFont(_shared_font(10, bold=True))
         self.send_button.setMinimumSize(80, 40)
         self.send_button.setDefault(True)
         
@@ -364,9 +784,13 @@ class ChatWindow(QMainWindow):
         self.send_button.clicked.connect(self.send_message)
         self.input_field.returnPressed.connect(self.send_message)
         
-        # Chat thread connections
-        self.chat_thread.message_received.connect(self.on_message_received)
-        self.chat_thread.error_occurred.connect(self.on_error_occurred)
+        # Chat worker connections
+        self.chat_worker.message_received.connect(self.on_message_received)
+        self.chat_worker.stream_started.connect(self.on_stream_started)
+        self.chat_worker.error_occurred.connect(self.on_error_occurred)
+        
+        # Shut the worker's event loop down with the application
+        QApplication.instance().aboutToQuit.connect(self.chat_worker.stop)
     
     def apply_theme(self):
         """Apply application theme"""
@@ -377,135 +801,107 @@ class ChatWindow(QMainWindow):
     
     def apply_dark_theme(self):
         """Apply dark theme"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            QScrollArea {
-                background-color: #1e1e1e;
-                border: none;
-            }
-            QLineEdit {
-                background-color: #3c3c3c;
-                border: 2px solid #555555;
-                border-radius: 20px;
-                padding: 8px 16px;
-                color: #ffffff;
-                font-size: 11pt;
-            }
-            QLineEdit:focus {
-                border-color: #0078d4;
-            }
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                border-radius: 20px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-            QMenuBar {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            QMenuBar::item:selected {
-                background-color: #0078d4;
-            }
-            QStatusBar {
-                background-color: #1e1e1e;
-                color: #cccccc;
-            }
-        """)
+        self._set_app_stylesheet(_DARK_STYLESHEET)
     
     def apply_light_theme(self):
         """Apply light theme"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #ffffff;
-                color: #000000;
-            }
-            QScrollArea {
-                background-color: #f5f5f5;
-                border: none;
-            }
-            QLineEdit {
-                background-color: #ffffff;
-                border: 2px solid #cccccc;
-                border-radius: 20px;
-                padding: 8px 16px;
-                color: #000000;
-                font-size: 11pt;
-            }
-            QLineEdit:focus {
-                border-color: #0078d4;
-            }
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                border-radius: 20px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-        """)
+        self._set_app_stylesheet(_LIGHT_STYLESHEET)
+    
+    def _set_app_stylesheet(self, stylesheet: str):
+        """Install a theme stylesheet on the application
+
+        Children inherit it from the application, so nothing is set on the
+        window itself; re-applying the current sheet is a no-op so the
+        widget tree is not re-polished needlessly.
+        """
+        app = QApplication.instance()
+        if app.styleSheet() != stylesheet:
+            app.setStyleSheet(stylesheet)
     
     def add_welcome_message(self):
         """Add welcome message to chat"""
-        welcome_text = """👋 **Welcome to Windows AI Agent!**
-
-I'm your intelligent desktop assistant. I can help you with:
-
-• **Desktop Automation** - Click, type, take screenshots
-• **File Operations** - Create, organize, and manage files  
-• **System Information** - Check performance and status
-• **Application Control** - Open and manage programs
-• **Code Execution** - Run Python code safely
-• **Natural Conversation** - Just ask me anything!
-
-**Quick Examples:**
-- "Take a screenshot"
-- "Open calculator" 
-- "Show system information"
-- "Create a file called notes.txt"
-
-Type your message below to get started! 🚀"""
-
-        self.add_message(welcome_text, "AI Assistant", time.time())
+        self.add_message(_WELCOME_TEXT, "AI Assistant", time.time())
     
     def add_message(self, message: str, sender: str, timestamp: float):
         """Add a message to the chat"""
+        self._insert_message_widget(message, sender, timestamp)
+        self._record_message(message, sender, timestamp)
+    
+    def add_messages(self, messages: List[Dict[str, Any]]):
+        """Add many messages at once
+
+        Every message goes into the history, but widgets are only built for
+        the ones that would survive the on-screen cap, and the view is not
+        repainted until all of them are in place.
+        """
+        if not messages:
+            return
+        
+        for msg in messages:
+            self._record_message(msg["message"], msg["sender"], msg["timestamp"])
+        
+        container = self.scroll_area.widget()
+        container.setUpdatesEnabled(False)
+        try:
+            for msg in messages[-self._max_visible_messages:]:
+                self._insert_message_widget(msg["message"], msg["sender"], msg["timestamp"])
+        finally:
+            container.setUpdatesEnabled(True)
+        
+        self._scroll_timer.start()
+    
+    def _insert_message_widget(self, message: str, sender: str, timestamp: float) -> MessageWidget:
+        """Create a message widget and add it to the chat view"""
         message_widget = MessageWidget(message, sender, timestamp)
         
         # Insert before typing indicator
         self.messages_layout.insertWidget(self.messages_layout.count() - 1, message_widget)
         
-        # Scroll to bottom
-        QTimer.singleShot(50, self.scroll_to_bottom)
+        # Drop the oldest widget once the on-screen cap is exceeded
+        # (+1 accounts for the typing indicator kept at the end)
+        if self.messages_layout.count() > self._max_visible_messages + 1:
+            oldest = self.messages_layout.takeAt(0).widget()
+            if oldest is not None:
+                oldest.setParent(None)
+                oldest.deleteLater()
+        
+        # Scroll to bottom, unless the user has scrolled up to read history
+        if sender == "You" or self._is_near_bottom():
+            self._scroll_timer.start()
         
-        # Store in history
-        self.conversation_history.append({
-            "message": message,
-            "sender": sender,
-            "timestamp": timestamp
-        })
+        return message_widget
+    
+    def _record_message(self, message: str, sender: str, timestamp: float):
+        """Store a message in the conversation history"""
+        self._hist_messages.append(message)
+        self._hist_senders.append(sender)
+        self._hist_timestamps.append(timestamp)
+    
+    @property
+    def conversation_history(self) -> List[Dict[str, Any]]:
+        """Conversation history as a list of message dicts"""
+        return [
+            {"message": message, "sender": sender, "timestamp": timestamp}
+            for message, sender, timestamp in zip(
+                self._hist_messages, self._hist_senders, self._hist_timestamps
+            )
+        ]
+    
+    def _clear_history(self):
+        """Drop all stored conversation history"""
+        self._hist_messages.clear()
+        self._hist_senders.clear()
+        self._hist_timestamps.clear()
+    
+    def _is_near_bottom(self, tolerance: int = 40) -> bool:
+        """Check whether the chat view is scrolled to (or close to) the end"""
+        vbar = self._vbar
+        return vbar.maximum() - vbar.value() <= tolerance
     
     def scroll_to_bottom(self):
         """Scroll chat area to bottom"""
-        scrollbar = self.scroll_area.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        vbar = self._vbar
+        vbar.setValue(vbar.maximum())
     
     def send_message(self):
         """Send user message"""
@@ -530,7 +926,47 @@ Type your message below to get started! 🚀"""
         self.status_label.setText("Processing...")
         
         # Send to agent
-        self.chat_thread.send_message(text)
+        self.chat_worker.send_message(text)
+    
+    @pyqtSlot()
+    def on_stream_started(self):
+        """Show the agent's reply and start draining its streamed chunks"""
+        if self._streaming_widget is None:
+            self.typing_indicator.stop_animation()
+            self._streaming_widget = self._insert_message_widget(
+                "", "AI Assistant", time.time()
+            )
+        self._chunk_timer.start()
+    
+    def _flush_chunks(self):
+        """Apply chunks streamed since the last frame to the reply"""
+        text = self.chat_worker.chunks.drain()
+        if self._streaming_widget is None or not text:
+            return
+        
+        at_bottom = self._is_near_bottom()
+        self._streaming_widget.append_text(text)
+        if at_bottom:
+            self._scroll_timer.start()
+    
+    def _finish_streaming(self, final_text: Optional[str] = None) -> bool:
+        """Finalize the in-progress streamed message, if any"""
+        self._chunk_timer.stop()
+        widget = self._streaming_widget
+        if widget is None:
+            # No reply on screen (e.g. the chat was cleared mid-stream), but
+            # the worker kept pushing; drop those chunks so they cannot be
+            # prepended to the next streamed reply
+            self.chat_worker.chunks.drain()
+            return False
+        
+        self._flush_chunks()
+        if final_text is not None:
+            widget.set_text(final_text)
+        
+        self._record_message(widget.message, widget.sender, widget.timestamp)
+        self._streaming_widget = None
+        return True
     
     @pyqtSlot(str)
     def on_message_received(self, response: str):
@@ -538,8 +974,9 @@ Type your message below to get started! 🚀"""
         # Stop typing indicator
         self.typing_indicator.stop_animation()
         
-        # Add AI response
-        self.add_message(response, "AI Assistant", time.time())
+        # Add AI response (already on screen if it was streamed)
+        if not self._finish_streaming(response):
+            self.add_message(response, "AI Assistant", time.time())
         
         # Re-enable input
         self.input_field.setEnabled(True)
@@ -551,8 +988,9 @@ Type your message below to get started! 🚀"""
     
     @pyqtSlot(str)
     def on_error_occurred(self, error: str):
-        """Handle errors from chat thread"""
+        """Handle errors from chat worker"""
         self.typing_indicator.stop_animation()
+        self._finish_streaming()
         
         error_msg = f"❌ **Error:** {error}"
         self.add_message(error_msg, "System", time.time())
@@ -599,8 +1037,15 @@ Please configure the agent and restart the application."""
                 if child.widget():
                     child.widget().deleteLater()
             
+            # Drop any half-streamed reply along with its widget. The chunk
+            # timer keeps running until the reply finishes: with no widget
+            # _flush_chunks discards what it drains, and without a consumer
+            # a long reply would fill the ring and stall the worker for good
+            self.chat_worker.chunks.drain()
+            self._streaming_widget = None
+            
             # Clear history
-            self.conversation_history.clear()
+            self._clear_history()
             
             # Clear agent history
             if self.agent and self.agent.gemini_client:
@@ -619,14 +1064,23 @@ Please configure the agent and restart the application."""
         )
         
         if filename:
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(self.conversation_history, f, indent=2)
-                
-                self.status_label.setText(f"Conversation saved to {filename}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save conversation: {e}")
+            # Serialize and write off the GUI thread; snapshot the history
+            # so later messages don't race with the writer
+            saver = ConversationSaver(self.conversation_history, filename)
+            saver.signals.finished.connect(self.on_conversation_saved)
+            saver.signals.failed.connect(self.on_conversation_save_failed)
+            self.status_label.setText("Saving conversation...")
+            QThreadPool.globalInstance().start(saver)
+    
+    @pyqtSlot(str)
+    def on_conversation_saved(self, filename: str):
+        """Handle a completed conversation save"""
+        self.status_label.setText(f"Conversation saved to {filename}")
+    
+    @pyqtSlot(str)
+    def on_conversation_save_failed(self, error: str):
+        """Handle a failed conversation save"""
+        QMessageBox.critical(self, "Error", f"Failed to save conversation: {error}")
     
     def load_conversation(self):
         """Load conversation from file"""
@@ -638,25 +1092,29 @@ Please configure the agent and restart the application."""
         )
         
         if filename:
-            try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    history = json.load(f)
-                
-                # Clear current chat
-                self.clear_chat()
-                
-                # Load messages
-                for msg in history:
-                    self.add_message(
-                        msg["message"],
-                        msg["sender"],
-                        msg["timestamp"]
-                    )
-                
-                self.status_label.setText(f"Conversation loaded from {filename}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load conversation: {e}")
+            # Read and parse off the GUI thread; only the widget work hops back
+            loader = ConversationLoader(filename)
+            loader.signals.loaded.connect(self.on_conversation_loaded)
+            loader.signals.failed.connect(self.on_conversation_load_failed)
+            self.status_label.setText("Loading conversation...")
+            QThreadPool.globalInstance().start(loader)
+    
+    @pyqtSlot(str, list)
+    def on_conversation_loaded(self, filename: str, history: list):
+        """Show a conversation parsed by ConversationLoader"""
+        # Clear current chat
+        self.clear_chat()
+        
+        # Load messages
+        self.add_messages(history)
+        
+        self.status_label.setText(f"Conversation loaded from {filename}")
+    
+    @pyqtSlot(str)
+    def on_conversation_load_failed(self, error: str):
+        """Handle a failed conversation load"""
+        QMessageBox.critical(self, "Error", f"Failed to load conversation: {error}")
+        self.status_label.setText("Ready")
     
     def show_settings(self):
         """Show settings dialog"""
@@ -733,6 +1191,16 @@ Please configure the agent and restart the application."""
                 self.raise_()
                 self.activateWindow()
     
+    def hideEvent(self, event):
+        """Pause the typing animation while hidden (e.g. in the tray)"""
+        self.typing_indicator.pause_animation()
+        super().hideEvent(event)
+    
+    def showEvent(self, event):
+        """Resume the typing animation paused by hideEvent"""
+        super().showEvent(event)
+        self.typing_indicator.resume_animation()
+    
     def closeEvent(self, event):
         """Handle window close event"""
         if hasattr(self, 'tray_icon') and self.tray_icon.isVisible():
@@ -754,6 +1222,9 @@ def main(agent=None):
     except:
         pass
     
+    # Install the theme before any widget exists so nothing is polished twice
+    app.setStyleSheet(_DARK_STYLESHEET if config.theme == "dark" else _LIGHT_STYLESHEET)
+    
     window = ChatWindow(agent)
     window.show()
     
@@ -4,20 +4,25 @@ Safe Python Code Execution Sandbox for Windows AI Agent
 
 import sys
 import ast
+import builtins
 import types
 import time
-import io
-import contextlib
 import subprocess
 import threading
+import queue
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from typing import Dict, Any, List, Optional, Set
 from pathlib import Path
 import tempfile
 import json
 import traceback
+import hashlib
+import importlib.util
+import textwrap
 
 try:
-    from RestrictedPython import compile_restricted
+    from RestrictedPython import compile_restricted_exec
     from RestrictedPython.Guards import safe_builtins, safe_globals
     from RestrictedPython.transformer import RestrictingNodeTransformer
     RESTRICTED_PYTHON_AVAILABLE = True
@@ -27,11 +32,184 @@ except ImportError:
     # Provide fallbacks
     safe_builtins = {}
     safe_globals = {}
-    compile_restricted = None
+    compile_restricted_exec = None
+
+# Numba is optional and heavy to import, so only probe for it here; it is
+# imported the first time a snippet is actually JIT-compiled
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
 
 from loguru import logger
 from ..utils.config import config
 
+# Number of validation results kept per process (oldest evicted first)
+VALIDATION_CACHE_SIZE = 256
+
+# Optimization level for sandboxed code. Always 0: user snippets keep their
+# asserts and see __debug__ as True, whatever flags the host runs with
+COMPILE_OPTIMIZE = 0
+
+# Isolated-mode sources up to this size are piped to the child via stdin
+ISOLATED_STDIN_MAX_CHARS = 100_000
+
+# Seconds a sandbox worker thread waits for work before exiting; the next
+# execution starts a fresh one
+WORKER_IDLE_TIMEOUT = 5.0
+
+
+# Safe built-in functions exposed to sandboxed code
+_SAFE_FUNCTIONS = frozenset({
+    'abs', 'all', 'any', 'bin', 'bool', 'chr', 'dict', 'dir',
+    'divmod', 'enumerate', 'filter', 'float', 'format', 'frozenset',
+    'hex', 'int', 'isinstance', 'issubclass', 'iter', 'len', 'list',
+    'map', 'max', 'min', 'oct', 'ord', 'pow', 'range', 'repr',
+    'reversed', 'round', 'set', 'slice', 'sorted', 'str', 'sum',
+    'tuple', 'type', 'zip'
+})
+
+
+def _build_safe_namespace() -> Dict[str, Any]:
+    """Build the instance-independent part of the safe namespace"""
+    # Start with restricted builtins
+    namespace = safe_builtins.copy()
+    
+    # Add safe builtins
+    builtins_dict = builtins.__dict__
+    for func_name in _SAFE_FUNCTIONS:
+        func = builtins_dict.get(func_name)
+        if func is not None:
+            namespace[func_name] = func
+    
+    return namespace
+
+
+# Built once per process; environments copy it and add their bound hooks
+_SAFE_NAMESPACE_TEMPLATE = _build_safe_namespace()
+
+# Validation results (including the compiled code object) keyed by source
+# digest. Validation does not depend on the environment, so every executor
+# in the process shares one cache and a snippet is compiled only once.
+_VALIDATION_CACHE: Dict[bytes, Dict[str, Any]] = {}
+_VALIDATION_CACHE_LOCK = threading.Lock()
+
+# Scalar types json can encode as-is
+_JSON_SAFE = (str, int, float, bool, type(None))
+
+
+def _is_json_safe(value: Any) -> bool:
+    """Check whether json can encode value
+
+    Scalars are decided by type alone; containers go through json.dumps,
+    whose C encoder beats any Python-level walk.
+    """
+    if isinstance(value, _JSON_SAFE):
+        return True
+    try:
+        json.dumps(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+# Nodes that may have side effects (output, assignment, suspension); an
+# expression free of them needs no output capture or variable extraction.
+# It still runs on the worker - comprehensions and ** can take unbounded time
+_SIDE_EFFECT_NODES = (ast.Call, ast.Await, ast.Yield, ast.YieldFrom, ast.NamedExpr)
+
+
+# Global a pure expression's value is stored in (skipped as a dunder name)
+_RETURN_VALUE_NAME = '__return_value__'
+
+
+def _is_pure_expression(tree: ast.Module) -> bool:
+    """Check whether a module is a single side-effect-free expression"""
+    body = tree.body
+    if len(body) != 1 or body[0].__class__ is not ast.Expr:
+        return False
+    return not any(isinstance(node, _SIDE_EFFECT_NODES) for node in ast.walk(body[0]))
+
+
+class _LazyBuffer:
+    """Minimal stdout/stderr sink that only allocates storage on first write"""
+    
+    __slots__ = ('data',)
+    
+    def __init__(self):
+        self.data = None
+    
+    def write(self, text: str) -> int:
+        if self.data is None:
+            self.data = [text]
+        else:
+            self.data.append(text)
+        return len(text)
+    
+    def flush(self):
+        pass
+    
+    def getvalue(self) -> str:
+        return ''.join(self.data) if self.data else ''
+
+
+class _ExecutionWorker:
+    """Reusable daemon thread that runs sandboxed code
+
+    Replaces a fresh thread per execution. The thread exits after
+    WORKER_IDLE_TIMEOUT seconds without work (the next submit starts a
+    new one) or once stop() is called. A worker stuck in a runaway
+    snippet cannot be killed, so the owner stops and abandons it; it
+    exits if the snippet ever finishes, and being a daemon it never
+    blocks interpreter exit.
+    """
+    
+    # Queued by stop(); the thread exits when it reaches it
+    _STOP = None
+    
+    def __init__(self):
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    def submit(self, code_obj: types.CodeType, namespace: Dict) -> Future:
+        """Queue a code object for execution, starting the thread if needed"""
+        future = Future()
+        with self._lock:
+            self._jobs.put((future, code_obj, namespace))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SandboxWorker", daemon=True)
+                self._thread.start()
+        return future
+    
+    def stop(self):
+        """Let the thread exit once the jobs queued so far have run"""
+        self._jobs.put(self._STOP)
+    
+    def _run(self):
+        """Worker loop"""
+        while True:
+            try:
+                job = self._jobs.get(timeout=WORKER_IDLE_TIMEOUT)
+            except queue.Empty:
+                # Idle: exit unless a submit slipped in before we got the lock
+                with self._lock:
+                    if self._jobs.empty():
+                        self._thread = None
+                        return
+                continue
+            if job is self._STOP:
+                return
+            
+            future, code_obj, namespace = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                exec(code_obj, namespace)
+                future.set_result(True)
+            except Exception as e:
+                future.set_exception(e)
+            except BaseException:
+                # e.g. SystemExit from the snippet - treat as unsuccessful
+                future.set_result(False)
+
 
 class SafeExecutionEnvironment:
     """Safe environment for Python code execution"""
@@ -44,30 +222,33 @@ class SafeExecutionEnvironment:
         self.allowed_modules = allowed_modules or config.allowed_modules
         self.memory_limit_mb = memory_limit_mb
         
+        # Import whitelist as a set plus submodule prefixes, and a memo of
+        # per-name decisions so repeated imports skip both checks
+        self._allowed_set = frozenset(self.allowed_modules)
+        self._allowed_prefixes = tuple(m + '.' for m in self.allowed_modules)
+        self._import_decisions: Dict[str, bool] = {}
+        
         # Create safe namespace
         self.safe_namespace = self._create_safe_namespace()
+        self._skip_names = frozenset(self.safe_namespace)
+        
+        # Builtins for executed code: the safe namespace layered over the
+        # regular builtins. Shared by every execution, so each run only
+        # allocates a small globals dict for its own variables. (This has to
+        # be a real dict - the import machinery rejects mapping proxies.)
+        self._exec_builtins = {**builtins.__dict__, **self.safe_namespace}
+        
+        # Started on first execution, replaced after a timeout; stopped when
+        # the environment is closed or garbage collected
+        self._worker: Optional[_ExecutionWorker] = None
+        self._worker_finalizer: Optional[weakref.finalize] = None
         
         logger.info(f"Safe execution environment initialized (timeout: {timeout}s)")
     
     def _create_safe_namespace(self) -> Dict[str, Any]:
         """Create a safe execution namespace"""
-        # Start with restricted builtins
-        namespace = safe_builtins.copy()
-        
-        # Add safe built-in functions
-        safe_functions = {
-            'abs', 'all', 'any', 'bin', 'bool', 'chr', 'dict', 'dir',
-            'divmod', 'enumerate', 'filter', 'float', 'format', 'frozenset',
-            'hex', 'int', 'isinstance', 'issubclass', 'iter', 'len', 'list',
-            'map', 'max', 'min', 'oct', 'ord', 'pow', 'range', 'repr',
-            'reversed', 'round', 'set', 'slice', 'sorted', 'str', 'sum',
-            'tuple', 'type', 'zip'
-        }
-        
-        # Add safe builtins
-        for func_name in safe_functions:
-            if hasattr(__builtins__, func_name):
-                namespace[func_name] = getattr(__builtins__, func_name)
+        # Start from the shared builtins template
+        namespace = dict(_SAFE_NAMESPACE_TEMPLATE)
         
         # Add safe modules
         namespace['__import__'] = self._safe_import
@@ -83,17 +264,14 @@ class SafeExecutionEnvironment:
     
     def _safe_import(self, name: str, globals=None, locals=None, fromlist=(), level=0):
         """Safe import function that only allows whitelisted modules"""
-        # Check if module is allowed
-        if name not in self.allowed_modules:
-            # Check if it's a submodule of an allowed module
-            allowed = False
-            for allowed_module in self.allowed_modules:
-                if name.startswith(allowed_module + '.'):
-                    allowed = True
-                    break
-            
-            if not allowed:
-                raise ImportError(f"Module '{name}' is not allowed in safe mode")
+        # Check if module (or its parent package) is allowed
+        allowed = self._import_decisions.get(name)
+        if allowed is None:
+            allowed = name in self._allowed_set or name.startswith(self._allowed_prefixes)
+            self._import_decisions[name] = allowed
+        
+        if not allowed:
+            raise ImportError(f"Module '{name}' is not allowed in safe mode")
         
         # Import the module normally
         return __import__(name, globals, locals, fromlist, level)
@@ -136,36 +314,49 @@ class SafeExecutionEnvironment:
                 return result
             
             # Create execution namespace
-            exec_namespace = self.safe_namespace.copy()
+            exec_namespace = {"__builtins__": self._exec_builtins}
             if variables:
                 exec_namespace.update(variables)
             
-            # Capture output
-            output_buffer = io.StringIO()
-            error_buffer = io.StringIO()
-            
-            with contextlib.redirect_stdout(output_buffer), \
-                 contextlib.redirect_stderr(error_buffer):
-                
-                # Execute with timeout
-                success = self._execute_with_timeout(code, exec_namespace)
-                
-                if success:
+            if validation.get("fast_path"):
+                # Pure expression: nothing to print or assign, so skip output
+                # capture - but keep the timeout, it can still run for long
+                if self._execute_with_timeout(validation["code_obj"], exec_namespace):
+                    result["return_value"] = exec_namespace.pop(_RETURN_VALUE_NAME, None)
                     result["success"] = True
-                    result["output"] = output_buffer.getvalue()
-                    
-                    # Extract variables (excluding builtins and modules)
-                    result["variables"] = self._extract_user_variables(exec_namespace)
+                    if variables:
+                        result["variables"] = self._extract_user_variables(exec_namespace)
                 else:
                     result["error"] = "Execution timed out"
-            
-            # Capture any error output
-            error_output = error_buffer.getvalue()
-            if error_output:
-                if result["error"]:
-                    result["error"] += f"\n{error_output}"
-                else:
-                    result["error"] = error_output
+            else:
+                # Capture output (swapped by hand rather than via contextlib)
+                output_buffer = _LazyBuffer()
+                error_buffer = _LazyBuffer()
+                saved_stdout, saved_stderr = sys.stdout, sys.stderr
+                sys.stdout, sys.stderr = output_buffer, error_buffer
+                
+                try:
+                    # Execute with timeout
+                    success = self._execute_with_timeout(validation["code_obj"], exec_namespace)
+                    
+                    if success:
+                        result["success"] = True
+                        result["output"] = output_buffer.getvalue()
+                        
+                        # Extract variables (excluding builtins and modules)
+                        result["variables"] = self._extract_user_variables(exec_namespace)
+                    else:
+                        result["error"] = "Execution timed out"
+                finally:
+                    sys.stdout, sys.stderr = saved_stdout, saved_stderr
+                
+                # Capture any error output
+                error_output = error_buffer.getvalue()
+                if error_output:
+                    if result["error"]:
+                        result["error"] += f"\n{error_output}"
+                    else:
+                        result["error"] = error_output
         
         except Exception as e:
             result["error"] = str(e)
@@ -178,31 +369,59 @@ class SafeExecutionEnvironment:
         return result
     
     def _validate_code(self, code: str) -> Dict[str, Any]:
-        """Validate code for safety and syntax"""
+        """Validate code for safety and syntax (cached by source digest)"""
+        key = hashlib.blake2b(code.encode('utf-8'), digest_size=16).digest()
+        cached = _VALIDATION_CACHE.get(key)
+        if cached is not None:
+            return dict(cached)
+        
+        result = self._validate_uncached(code)
+        
+        with _VALIDATION_CACHE_LOCK:
+            if len(_VALIDATION_CACHE) >= VALIDATION_CACHE_SIZE:
+                del _VALIDATION_CACHE[next(iter(_VALIDATION_CACHE))]
+            _VALIDATION_CACHE[key] = result
+        return dict(result)
+    
+    def _validate_uncached(self, code: str) -> Dict[str, Any]:
+        """Parse, inspect and compile code to decide whether it is safe"""
         try:
             # Parse AST to check for dangerous operations
             tree = ast.parse(code)
             
             # Check for prohibited operations
-            validator = CodeValidator()
-            validator.visit(tree)
+            try:
+                validate_ast(tree)
+            except _ValidationFailed as e:
+                return {"valid": False, "error": str(e)}
             
             # Try compilation with RestrictedPython if available
-            if RESTRICTED_PYTHON_AVAILABLE and compile_restricted is not None:
-                compiled = compile_restricted(code, '<string>', 'exec')
-                if compiled.errors:
-                    return {
-                        "valid": False,
-                        "error": f"Compilation errors: {'; '.join(compiled.errors)}"
-                    }
-                compiled = compile_restricted(code, '<string>', 'exec')
+            # (compile_restricted_exec reports problems in .errors on every
+            # RestrictedPython release; compile_restricted no longer does)
+            if RESTRICTED_PYTHON_AVAILABLE and compile_restricted_exec is not None:
+                compiled = compile_restricted_exec(code, '<string>')
                 if compiled.errors:
                     return {
                         "valid": False,
                         "error": f"Compilation errors: {'; '.join(compiled.errors)}"
                     }
             
-            return {"valid": True}
+            # Single side-effect-free expressions store their value in a
+            # global so execution can skip output capture
+            if _is_pure_expression(tree):
+                assign = ast.Assign(
+                    targets=[ast.Name(_RETURN_VALUE_NAME, ast.Store())],
+                    value=tree.body[0].value
+                )
+                module = ast.fix_missing_locations(ast.Module(body=[assign], type_ignores=[]))
+                code_obj = compile(module, '<string>', 'exec', optimize=COMPILE_OPTIMIZE)
+                return {"valid": True, "code_obj": code_obj, "fast_path": True}
+            
+            # Compile the already-parsed tree once; execution reuses this
+            # code object instead of compiling the source again
+            code_obj = compile(tree, '<string>', 'exec', optimize=COMPILE_OPTIMIZE)
+            
+            return {"valid": True, "code_obj": code_obj}
             
         except SyntaxError as e:
             return {
@@ -215,108 +434,232 @@ class SafeExecutionEnvironment:
                 "error": f"Validation error: {e}"
             }
     
-    def _execute_with_timeout(self, code: str, namespace: Dict) -> bool:
-        """Execute code with timeout protection"""
-        success = False
-        exception = None
-        
-        def target():
-            nonlocal success, exception
-            try:
-                exec(code, namespace)
-                success = True
-            except Exception as e:
-                exception = e
-        
-        # Run in thread with timeout
-        thread = threading.Thread(target=target)
-        thread.daemon = True
-        thread.start()
-        thread.join(timeout=self.timeout)
-        
-        if thread.is_alive():
-            # Thread is still running - timeout occurred
+    def _execute_with_timeout(self, code_obj: types.CodeType, namespace: Dict) -> bool:
+        """Execute a compiled code object with timeout protection"""
+        worker = self._worker
+        if worker is None:
+            worker = self._worker = _ExecutionWorker()
+            self._worker_finalizer = weakref.finalize(self, worker.stop)
+        
+        future = worker.submit(code_obj, namespace)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # The snippet still owns the worker thread - leave it behind
+            self.close()
             return False
-        
-        if exception:
-            raise exception
-        
-        return success
+    
+    def close(self):
+        """Stop the worker thread; a later execution starts a new one"""
+        finalizer = self._worker_finalizer
+        self._worker = self._worker_finalizer = None
+        if finalizer is not None:
+            finalizer()
     
     def _extract_user_variables(self, namespace: Dict) -> Dict[str, Any]:
         """Extract user-defined variables from namespace"""
         user_vars = {}
         
-        # Skip built-in and system variables
-        skip_prefixes = ('__', '_')
-        skip_names = set(self.safe_namespace.keys())
+        # Skip private/dunder names and anything from the safe namespace
+        skip_names = self._skip_names
         
         for name, value in namespace.items():
-            if (not name.startswith(skip_prefixes) and 
+            if (name[:1] != '_' and 
                 name not in skip_names and
                 not isinstance(value, (types.ModuleType, types.FunctionType))):
                 
-                # Convert to JSON-serializable format
-                try:
-                    json.dumps(value)  # Test if serializable
+                # Keep JSON-compatible values, stringify the rest
+                if _is_json_safe(value):
                     user_vars[name] = value
-                except (TypeError, ValueError):
+                else:
                     user_vars[name] = str(value)  # Fallback to string representation
         
         return user_vars
 
 
-class CodeValidator(ast.NodeVisitor):
-    """AST visitor to validate code for security violations"""
+# Prohibited operations
+_PROHIBITED_FUNCTIONS = frozenset({
+    'exec', 'eval', 'compile', 'open', '__import__',
+    'getattr', 'setattr', 'delattr', 'hasattr',
+    'globals', 'locals', 'vars', 'dir'
+})
+
+_PROHIBITED_MODULES = frozenset({
+    'os', 'sys', 'subprocess', 'socket', 'urllib',
+    'requests', 'shutil', 'pathlib', 'tempfile'
+})
+
+
+class _ValidationFailed(Exception):
+    """Raised by the AST checks on the first security violation"""
+
+
+def _check_call(node: ast.Call):
+    """Check function calls"""
+    func = node.func
+    if func.__class__ is ast.Name and func.id in _PROHIBITED_FUNCTIONS:
+        raise _ValidationFailed(f"Prohibited function: {func.id}")
+
+
+def _check_import(node: ast.Import):
+    """Check imports"""
+    for alias in node.names:
+        module_name = alias.name.split('.')[0]
+        if module_name in _PROHIBITED_MODULES:
+            raise _ValidationFailed(f"Prohibited import: {module_name}")
+
+
+def _check_import_from(node: ast.ImportFrom):
+    """Check from imports"""
+    if node.module:
+        module_name = node.module.split('.')[0]
+        if module_name in _PROHIBITED_MODULES:
+            raise _ValidationFailed(f"Prohibited import from: {module_name}")
+
+
+def _check_attribute(node: ast.Attribute):
+    """Check attribute access"""
+    # Check for dangerous attribute access
+    if node.attr.startswith('_'):
+        raise _ValidationFailed(f"Prohibited attribute access: {node.attr}")
+
+
+# Node type -> checker; every other node type is only traversed
+_NODE_CHECKS = {
+    ast.Call: _check_call,
+    ast.Import: _check_import,
+    ast.ImportFrom: _check_import_from,
+    ast.Attribute: _check_attribute,
+}
+
+
+def validate_ast(tree: ast.AST):
+    """Walk a parsed tree once, raising _ValidationFailed on the first violation"""
+    checks_get = _NODE_CHECKS.get
+    for node in ast.walk(tree):
+        check = checks_get(node.__class__)
+        if check is not None:
+            check(node)
+
+
+class CodeValidator:
+    """Validate code for security violations
+
+    Kept for callers of the old visitor API; the work is done by
+    validate_ast, which stops at the first violation.
+    """
+    
+    prohibited_functions = _PROHIBITED_FUNCTIONS
+    prohibited_modules = _PROHIBITED_MODULES
     
     def __init__(self):
         self.violations = []
-        
-        # Prohibited operations
-        self.prohibited_functions = {
-            'exec', 'eval', 'compile', 'open', '__import__',
-            'getattr', 'setattr', 'delattr', 'hasattr',
-            'globals', 'locals', 'vars', 'dir'
-        }
-        
-        self.prohibited_modules = {
-            'os', 'sys', 'subprocess', 'socket', 'urllib',
-            'requests', 'shutil', 'pathlib', 'tempfile'
-        }
     
-    def visit_Call(self, node):
-        """Check function calls"""
-        if isinstance(node.func, ast.Name):
-            if node.func.id in self.prohibited_functions:
-                self.violations.append(f"Prohibited function: {node.func.id}")
-        
-        self.generic_visit(node)
+    def visit(self, tree: ast.AST):
+        """Record the first violation in the given tree, if any"""
+        try:
+            validate_ast(tree)
+        except _ValidationFailed as e:
+            self.violations.append(str(e))
+
+
+# Node types allowed in a snippet handed to Numba: float arithmetic,
+# comparisons and while/if control flow. Integers (which Numba would wrap
+# at 64 bits), ** (complex results in Python) and for loops (int targets
+# that stay unbound on empty ranges) are left to the regular sandbox
+_JIT_NODES = frozenset({
+    ast.Module, ast.Assign, ast.AugAssign, ast.While, ast.If,
+    ast.Break, ast.Continue, ast.Pass, ast.Name, ast.Constant, ast.Call,
+    ast.BinOp, ast.UnaryOp, ast.Compare, ast.IfExp,
+    ast.Load, ast.Store,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+    ast.UAdd, ast.USub,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+})
+
+# Builtins a JIT snippet may call
+_JIT_CALLS = frozenset({'abs', 'min', 'max', 'float'})
+
+# Runs a compiled kernel on the sandbox worker so the timeout still applies
+_JIT_CALL_CODE = compile("_jit_result = _jit_fn(*_jit_args)", "<jit>", "exec")
+
+
+def _names(node: ast.AST):
+    """Return the (loaded, stored) names in a statement"""
+    loaded, stored = set(), set()
+    for child in ast.walk(node):
+        if child.__class__ is ast.Name:
+            if child.ctx.__class__ is ast.Store:
+                stored.add(child.id)
+            elif child.id not in _JIT_CALLS:
+                loaded.add(child.id)
+        elif child.__class__ is ast.AugAssign:
+            loaded.add(child.target.id)  # x += 1 reads x too
+    return loaded, stored
+
+
+def _cache_put(cache: Dict[str, Any], key: str, value: Any):
+    """Store a value in a per-source cache, evicting the oldest entry when full"""
+    if len(cache) >= VALIDATION_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+def _plan_jit(code: str):
+    """Return (tree, params, outputs) if code is a loop Numba runs exactly like Python
+
+    params are the session variables the snippet reads, which must all be
+    floats when it runs; outputs are every name it assigns. The plan only
+    depends on the source, so callers can cache it.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
     
-    def visit_Import(self, node):
-        """Check imports"""
-        for alias in node.names:
-            module_name = alias.name.split('.')[0]
-            if module_name in self.prohibited_modules:
-                self.violations.append(f"Prohibited import: {module_name}")
-        
-        self.generic_visit(node)
+    has_loop = False
     
-    def visit_ImportFrom(self, node):
-        """Check from imports"""
-        if node.module:
-            module_name = node.module.split('.')[0]
-            if module_name in self.prohibited_modules:
-                self.violations.append(f"Prohibited import from: {module_name}")
-        
-        self.generic_visit(node)
+    for node in ast.walk(tree):
+        cls = node.__class__
+        if cls not in _JIT_NODES:
+            return None
+        if cls is ast.Constant:
+            if node.value.__class__ not in (float, bool):
+                return None
+        elif cls is ast.Call:
+            if (node.func.__class__ is not ast.Name or node.func.id not in _JIT_CALLS
+                    or node.keywords):
+                return None
+        elif cls is ast.Assign:
+            if len(node.targets) != 1 or node.targets[0].__class__ is not ast.Name:
+                return None
+        elif cls is ast.AugAssign:
+            if node.target.__class__ is not ast.Name:
+                return None
+        elif cls is ast.While:
+            has_loop = True
     
-    def visit_Attribute(self, node):
-        """Check attribute access"""
-        # Check for dangerous attribute access
-        if isinstance(node.attr, str) and node.attr.startswith('_'):
-            self.violations.append(f"Prohibited attribute access: {node.attr}")
-        
-        self.generic_visit(node)
+    # Straight-line arithmetic is faster to exec than to compile
+    if not has_loop:
+        return None
+    
+    # Every name must be bound before any loop or branch that touches it, so
+    # no variable's existence depends on how many times a loop ran
+    bound, params, outputs = set(), [], set()
+    for stmt in tree.body:
+        loaded, stored = _names(stmt)
+        for name in sorted(loaded - bound):
+            params.append(name)
+            bound.add(name)
+        if stmt.__class__ is not ast.Assign and stmt.__class__ is not ast.AugAssign:
+            if stored - bound:
+                return None
+        bound |= stored
+        outputs |= stored
+    
+    if not outputs:
+        return None
+    return tree, tuple(params), tuple(sorted(outputs))
 
 
 class CodeExecutor:
@@ -330,6 +673,12 @@ class CodeExecutor:
         
         self.session_variables = {}
         
+        # Opt-in: only float loops qualify, and kernels cost a compile each
+        self.jit_enabled = NUMBA_AVAILABLE and config.enable_jit_execution
+        # Both keyed by source; False marks a snippet that cannot be JIT-compiled
+        self._jit_plans: Dict[str, Any] = {}
+        self._jit_kernels: Dict[str, Any] = {}
+        
     def execute(self, code: str, mode: str = "safe") -> Dict[str, Any]:
         """Execute code with specified mode"""
         if mode == "safe":
@@ -351,21 +700,31 @@ class CodeExecutor:
     def _execute_isolated(self, code: str) -> Dict[str, Any]:
         """Execute in completely isolated environment (subprocess)"""
         try:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
-            
-            # Execute in subprocess
-            result = subprocess.run(
-                [sys.executable, temp_file],
-                capture_output=True,
-                text=True,
-                timeout=self.environment.timeout
-            )
-            
-            # Clean up
-            Path(temp_file).unlink()
+            if len(code) <= ISOLATED_STDIN_MAX_CHARS:
+                # Feed the source through the child's stdin - no disk round-trip
+                result = subprocess.run(
+                    [sys.executable, "-"],
+                    input=code,
+                    capture_output=True,
+                    text=True,
+                    timeout=self.environment.timeout
+                )
+            else:
+                # Very large sources still go through a temporary file
+                with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+                    f.write(code)
+                    temp_file = f.name
+                
+                try:
+                    result = subprocess.run(
+                        [sys.executable, temp_file],
+                        capture_output=True,
+                        text=True,
+                        timeout=self.environment.timeout
+                    )
+                finally:
+                    # Clean up
+                    Path(temp_file).unlink()
             
             return {
                 "success": result.returncode == 0,
@@ -387,7 +746,9 @@ class CodeExecutor:
     
     def _execute_persistent(self, code: str) -> Dict[str, Any]:
         """Execute with persistent session variables"""
-        result = self.environment.execute_code(code, self.session_variables)
+        result = self._execute_jit(code) if self.jit_enabled else None
+        if result is None:
+            result = self.environment.execute_code(code, self.session_variables)
         
         if result["success"]:
             # Update session variables
@@ -396,6 +757,97 @@ class CodeExecutor:
         
         return result
     
+    def _execute_jit(self, code: str) -> Optional[Dict[str, Any]]:
+        """Run a float loop snippet as a Numba kernel
+
+        Returns None when the snippet is not eligible or Numba cannot
+        compile it, in which case the caller falls back to the regular
+        sandbox. Errors raised while the kernel runs are reported as usual.
+        """
+        # Most persistent snippets are not eligible; remember that per source
+        # so they are parsed and walked only once
+        plan = self._jit_plans.get(code)
+        if plan is None:
+            plan = _plan_jit(code) or False
+            _cache_put(self._jit_plans, code, plan)
+        if plan is False:
+            return None
+        tree, params, outputs = plan
+        
+        session = self.session_variables
+        if any(session.get(name).__class__ is not float for name in params):
+            return None
+        
+        validation = self.environment._validate_code(code)
+        if not validation["valid"]:
+            return None
+        
+        kernel = self._jit_kernels.get(code)
+        if kernel is False:
+            return None
+        if kernel is None:
+            kernel = self._compile_jit_kernel(tree, params, outputs) or False
+            _cache_put(self._jit_kernels, code, kernel)
+            if kernel is False:
+                return None
+        
+        start_time = time.time()
+        result = {
+            "success": False,
+            "output": "",
+            "error": None,
+            "execution_time": 0,
+            "variables": {},
+            "return_value": None
+        }
+        # The call code is ours, not the user's, so it gets real builtins
+        # (Numba needs them to raise errors from inside the kernel)
+        namespace = {"__builtins__": builtins.__dict__, "_jit_fn": kernel,
+                     "_jit_args": tuple(session[name] for name in params)}
+        try:
+            if self.environment._execute_with_timeout(_JIT_CALL_CODE, namespace):
+                result["success"] = True
+                # Report the whole session, as the exec path does
+                merged = {**session, **dict(zip(outputs, namespace["_jit_result"]))}
+                result["variables"] = self.environment._extract_user_variables(merged)
+            else:
+                result["error"] = "Execution timed out"
+        except Exception as e:
+            result["error"] = str(e)
+            result["traceback"] = traceback.format_exc()
+        
+        result["execution_time"] = time.time() - start_time
+        logger.info(f"JIT execution completed: success={result['success']}, time={result['execution_time']:.3f}s")
+        return result
+    
+    def _compile_jit_kernel(self, tree: ast.Module, params: tuple, outputs: tuple):
+        """Compile a snippet for float arguments, or return None if Numba rejects it"""
+        from numba import njit, types as nb_types
+        from numba.core.errors import NumbaError
+        
+        source = (
+            f"def _jit_body({', '.join(params)}):\n"
+            f"{textwrap.indent(ast.unparse(tree), '    ')}\n"
+            f"    return ({', '.join(outputs)},)\n"
+        )
+        namespace: Dict[str, Any] = {}
+        exec(source, namespace)
+        
+        # nogil lets the waiting thread notice a timeout while the kernel
+        # is still spinning
+        kernel = njit(nogil=True)(namespace['_jit_body'])
+        try:
+            kernel.compile((nb_types.float64,) * len(params))
+        except NumbaError as e:
+            logger.debug(f"Numba cannot compile snippet, using exec: {e}")
+            return None
+        
+        # Only float and bool results match Python exactly
+        return_types = kernel.nopython_signatures[0].return_type
+        if not all(t in (nb_types.float64, nb_types.boolean) for t in return_types):
+            return None
+        return kernel
+    
     def clear_session(self):
         """Clear persistent session variables"""
         self.session_variables.clear()
@@ -3,12 +3,34 @@ Configuration management for Windows AI Agent
 """
 
 import os
+import pickle
+import re
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 import yaml
 from loguru import logger
 
+# Marks a key that was looked up and not found
+_MISSING = object()
+
+# libyaml's C loader when available (much faster), pure-Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# String -> bool for the recognised boolean spellings (matched lowercased)
+_BOOLS = {
+    'true': True, 'yes': True, '1': True,
+    'false': False, 'no': False, '0': False,
+}
+
+# Decimal or scientific notation, e.g. "3.14", "-.5", "1e-3"
+_FLOAT_RE = re.compile(r'[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?')
+
+# Upper bound on threads used to read config files concurrently
+CONFIG_LOAD_WORKERS = 4
+
 
 class Config:
     """Configuration manager for the Windows AI Agent"""
@@ -17,6 +39,15 @@ class Config:
         self.config_path = config_path or Path(__file__).parent.parent.parent
         self._load_environment()
         self._config_data = self._load_config_files()
+        self._flat_config = self._flatten_config(self._config_data)
+        self._get_cache: Dict[str, Any] = {}
+    
+    def reload(self):
+        """Re-read the .env and YAML files and drop memoized lookups"""
+        self._load_environment()
+        self._config_data = self._load_config_files()
+        self._flat_config = self._flatten_config(self._config_data)
+        self._get_cache.clear()
         
     def _load_environment(self):
         """Load environment variables from .env file"""
@@ -33,51 +64,111 @@ class Config:
         config_data = {}
         
         if config_dir.exists():
-            for config_file in config_dir.glob("*.yaml"):
-                try:
-                    with open(config_file, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
-                        config_data[config_file.stem] = data
-                        logger.info(f"Loaded config from {config_file}")
-                except Exception as e:
-                    logger.error(f"Failed to load config {config_file}: {e}")
+            config_files = list(config_dir.glob("*.yaml"))
+            if len(config_files) > 1:
+                # File reads and libyaml parsing release the GIL, so overlap them
+                workers = min(CONFIG_LOAD_WORKERS, len(config_files))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(self._load_one, config_files))
+            else:
+                results = [self._load_one(f) for f in config_files]
+            
+            for stem, data in results:
+                if data is not _MISSING:
+                    config_data[stem] = data
         
         return config_data
     
+    def _load_one(self, config_file: Path):
+        """Load a single YAML file, returning (stem, data) or (stem, _MISSING) on failure"""
+        try:
+            data = self._load_yaml_cached(config_file)
+            logger.info(f"Loaded config from {config_file}")
+            return config_file.stem, data
+        except Exception as e:
+            logger.error(f"Failed to load config {config_file}: {e}")
+            return config_file.stem, _MISSING
+    
+    @staticmethod
+    def _flatten_config(config_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge the top-level keys of every config file into one dict
+
+        The first file to define a key wins, matching the old per-file scan.
+        """
+        flat: Dict[str, Any] = {}
+        for config_name, data in config_data.items():
+            if not isinstance(data, dict):
+                continue
+            for key, value in data.items():
+                if key in flat:
+                    logger.warning(f"Config key '{key}' in {config_name} is shadowed by an earlier file")
+                    continue
+                flat[key] = value
+        return flat
+    
+    def _load_yaml_cached(self, config_file: Path) -> Any:
+        """Load a YAML file, reusing a pickled parse while the file is unchanged"""
+        stat = config_file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cache_file = Path(self.config_path) / ".cache" / "config" / f"{config_file.name}.pkl"
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_stamp, data = pickle.load(f)
+            if cached_stamp == stamp:
+                return data
+        except Exception:
+            pass  # Missing or unreadable cache - parse the YAML instead
+        
+        with open(config_file, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=_YAML_LOADER)
+        
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'wb') as f:
+                pickle.dump((stamp, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            logger.debug(f"Could not write config cache {cache_file}: {e}")
+        
+        return data
+    
     def get(self, key: str, default: Any = None) -> Any:
-        """Get configuration value with environment variable precedence"""
+        """Get configuration value with environment variable precedence
+
+        Lookups are memoized; call reload() to pick up later changes.
+        """
+        try:
+            value = self._get_cache[key]
+        except KeyError:
+            value = self._get_cache[key] = self._lookup(key)
+        
+        return default if value is _MISSING else value
+    
+    def _lookup(self, key: str) -> Any:
+        """Resolve a key from the environment, then the config files"""
         # First check environment variables
         env_value = os.getenv(key.upper())
         if env_value is not None:
             return self._convert_type(env_value)
         
-        # Then check config files
-        for config_name, config_data in self._config_data.items():
-            if key in config_data:
-                return config_data[key]
-        
-        return default
-    
-    def _convert_type(self, value: str) -> Any:
-        """Convert string environment variables to appropriate types"""
-        if value.lower() in ('true', 'yes', '1'):
-            return True
-        elif value.lower() in ('false', 'no', '0'):
-            return False
-        elif value.isdigit():
-            return int(value)
-        elif self._is_float(value):
-            return float(value)
-        else:
-            return value
+        # Then check the merged config files
+        return self._flat_config.get(key, _MISSING)
     
-    def _is_float(self, value: str) -> bool:
-        """Check if string can be converted to float"""
-        try:
-            float(value)
-            return True
-        except ValueError:
-            return False
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _convert_type(value: str) -> Any:
+        """Convert string environment variables to appropriate types (cached per string)"""
+        text = value.strip()
+        
+        flag = _BOOLS.get(text.lower())
+        if flag is not None:
+            return flag
+        digits = text[1:] if text[:1] in ('+', '-') else text
+        if digits.isdecimal():
+            return int(text)
+        if _FLOAT_RE.fullmatch(text):
+            return float(text)
+        return value
     
     @property
     def google_api_key(self) -> str:
@@ -124,6 +215,16 @@ class Config:
         """Get max conversation history"""
         return int(self.get("MAX_CONVERSATION_HISTORY", 100))
     
+    @property
+    def max_chat_history(self) -> int:
+        """Get max messages kept in the chat window history"""
+        return int(self.get("MAX_CHAT_HISTORY", 5000))
+    
+    @property
+    def max_visible_messages(self) -> int:
+        """Get max message widgets kept on screen in the chat window"""
+        return int(self.get("MAX_VISIBLE_MESSAGES", 500))
+    
     @property
     def window_width(self) -> int:
         """Get window width"""
@@ -151,7 +252,41 @@ class Config:
     def sandbox_timeout(self) -> int:
         """Get sandbox timeout in seconds"""
         return int(self.get("SANDBOX_TIMEOUT", 30))
+    
+    @property
+    def enable_jit_execution(self) -> bool:
+        """Get whether numeric session code may be JIT-compiled with Numba"""
+        return bool(self.get("ENABLE_JIT_EXECUTION", False))
+
+
+class _LazyConfig:
+    """Proxy for the global Config that builds it on first attribute access
+
+    Importing this module stays free of disk I/O; the .env and YAML files
+    are only read once something actually asks for a setting.
+    """
+    
+    __slots__ = ('_instance',)
+    
+    def __init__(self):
+        object.__setattr__(self, '_instance', None)
+    
+    def _get_instance(self) -> Config:
+        instance = self._instance
+        if instance is None:
+            instance = Config()
+            object.__setattr__(self, '_instance', instance)
+        return instance
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get_instance(), name)
+    
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._get_instance(), name, value)
+    
+    def __repr__(self) -> str:
+        return repr(self._get_instance())
 
 
-# Global config instance
-config = Config()
\ No newline at end of file
+# Global config instance (created lazily)
+config = _LazyConfig()
\ No newline at end of file
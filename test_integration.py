@@ -13,6 +13,13 @@ sys.path.insert(0, str(project_root / "src"))
 sys.path.insert(0, str(project_root))
 from main import IntegratedWindowsAgent
 
+# Winloop (libuv) is much lighter than the default Proactor loop on Windows
+try:
+    import winloop
+    WINLOOP_AVAILABLE = sys.platform == "win32"
+except ImportError:
+    WINLOOP_AVAILABLE = False
+
 async def test_automation_commands():
     """Test automation commands through the integrated agent"""
     print("🧪 Testing Integrated Agent Automation")
@@ -43,4 +50,6 @@ async def test_automation_commands():
             print(f"   ❌ Error: {str(e)}")
 
 if __name__ == "__main__":
+    if WINLOOP_AVAILABLE:
+        winloop.install()
     asyncio.run(test_automation_commands())
\ No newline at end of file